@@ -56,7 +56,7 @@ class Command(DataObject):
                     # Replace with api.ApiException
                     raise InvalidArgument(
                         "Argument extraction failed!",
-                        {'arguments' : request.args, 'exception' : str(e)}
+                        {'arguments' : request.args.to_dict(), 'exception' : str(e)}
                     ) from None
 
                 self.args.id = int(id) if begin else None
@@ -66,7 +66,7 @@ class Note(DataObject):
                 except Exception as e:
                     raise InvalidArgument(
                         "Argument parsing error",
-                        {'arguments' : request.args, 'exception' : str(e)}
+                        {'arguments' : request.args.to_dict(), 'exception' : str(e)}
                     )
 
                 # Convert to desired types
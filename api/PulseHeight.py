@@ -75,7 +75,7 @@ class PulseHeight(DataObject):
                     # Replace with api.ApiException
                     raise InvalidArgument(
                         "Argument extraction failed!",
-                        {'arguments' : request.args, 'exception' : str(e)}
+                        {'arguments' : request.args.to_dict(), 'exception' : str(e)}
                     ) from None
 
                 # Convert to desired types (or create as None's)
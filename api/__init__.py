@@ -13,6 +13,9 @@
 #   0.3.0   2018.10.29  Enhanced Flask.Response creation.
 #   0.4.0   2018.11.04  Changes for CSV streaming support.
 #   0.4.1   2018.11.05  Documentation update.
+#   0.5.0   2026.09.01  JSON serialization with orjson, when available.
+#   0.5.1   2026.09.01  Cache table schemas; avoid per-request pragma query.
+#   0.5.2   2026.09.01  Column metadata held in namedtuples, not DotDicts.
 #
 #
 #   Module for PATE Monitor Resource Objects/Classes and API
@@ -65,14 +68,93 @@
 # - or they raise ApiExceptions (see this file) when necessary.
 #
 
+import io
+import csv
 import time
 import json
 
+from collections    import namedtuple
+from traceback      import format_exception
+
+# orjson serializes in C and returns bytes directly - many times faster
+# than stdlib json on the per-request hot path. Fall back to stdlib json
+# where orjson is not installed (functionally identical output).
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# NumPy and Numba are optional. When present, numba_aggregate() (below)
+# offers DataObject subclasses compiled numeric post-processing for the
+# telemetry endpoints; when absent, everything still works in pure Python.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 from flask          import request
 from flask          import g
+from flask          import stream_with_context
+
+from werkzeug.datastructures    import Headers
+from werkzeug.wrappers          import Response
+
 from application    import app
 
 
+#
+# Database schema is static for the lifetime of the process. Column metadata
+# is read with a pragma_table_info() query on first use and cached here,
+# keyed by (table, exclude) - DataObject instantiation happens on every API
+# request and must not pay for a schema query each time.
+#
+_schema_cache = {}
+
+#
+# The set of methods for a route rule is fixed once the application has
+# started, but __make_response() used to filter and join it again for every
+# single response. Joined 'Allow' header strings are cached here per rule.
+#
+_allow_header_cache = {}
+
+#
+# SELECT clauses and WHERE condition fragments are pure functions of the
+# (static) table schema and the column lists given by the route handlers.
+# The input space is a handful of signatures, so the built strings are
+# cached here instead of being reassembled on every request.
+#
+_select_clause_cache = {}
+_where_condition_cache = {}
+
+#
+# Datatype specific SQL formatting, keyed by column datatype. Datatypes not
+# listed need no conversion and use the plain column name ('{0}'). Keeping
+# the rules in one table means adding handling for a new datatype is a
+# one-line change instead of three if/elif chains.
+#
+_select_templates = {
+    'TIMESTAMP' : "CAST(strftime('%s', {0}) as integer) AS {0}",
+    'DATETIME'  : "datetime({0}) AS {0}"
+}
+_where_templates = {
+    'TIMESTAMP' : "CAST(strftime('%s', {0}) as integer)",
+    'DATETIME'  : "datetime({0})"
+}
+
+
+def _allow_header(rule):
+    """Return the (cached) Allow header value for the given route rule."""
+    allow = _allow_header_cache.get(rule)
+    if allow is None:
+        allow = ", ".join(sorted(rule.methods - {'HEAD', 'OPTIONS'}))
+        _allow_header_cache[rule] = allow
+    return allow
+
+
 ###############################################################################
 #
 # DataObject class (SQLite3 utilities)
@@ -105,57 +187,59 @@ from application    import app
 #   SQLite natively supports only the types TEXT, INTEGER, REAL, BLOB and NULL.
 #
 class DataObject(list):
-    # class Column:
-    #     __slots__ = ('name', 'datatype', 'nullable', 'default', 'primarykey')
-    #     def __init__(
-    #         self,
-    #         name,
-    #         datatype,
-    #         nullable,
-    #         default,
-    #         primarykey
-    #     ):
-    #         self.name       = name
-    #         self.datatype   = datatype
-    #         self.nullable   = nullable
-    #         self.default    = default
-    #         self.primarykey = primarykey
-
-    class DotDict(dict):
-        """dot.notation access to dictionary attributes"""
-        __getattr__ = dict.get
-        __setattr__ = dict.__setitem__
-        __delattr__ = dict.__delitem__
-        def __missing__(self, key):
-            """Return None if non-existing key is accessed"""
-            return None
-        def __str__(self):
-            return self.getattr('name', '(null)')
+
+    # One Column per table column. A namedtuple is roughly a third of the
+    # size of the dict subclass it replaced, attribute access is a direct
+    # C-level read (no __getattr__ indirection) and instances are hashable,
+    # making the cached schema entries safely shareable between requests.
+    Column = namedtuple(
+        'Column',
+        ('name', 'datatype', 'nullable', 'default', 'primarykey')
+    )
 
     def __init__(self, cursor, table, exclude = []):
-        # pragma_table_info() columns:
-        # cid           Column ID number
-        # name          Column name
-        # type          INTEGER | DATETIME | ...
-        # notnull       1 = NOT NULL, 0 = NULL
-        # dflt_value    Default value
-        # pk            1 = PRIMARY KEY, 0 = not
-        cursor.execute("SELECT * FROM pragma_table_info('{}')".format(table))
-        for row in cursor:
-            if row[1] not in exclude:
-                self.append(
-                    self.DotDict(
-                        name        = row[1],
-                        datatype    = row[2],
-                        nullable    = True if row[3] == 0 else False,
-                        default     = row[4],
-                        primarykey  = True if row[5] == 1 else False
-                    )
+        self.cursor = cursor
+        self.table = table
+        self._session_id = None
+        # Column metadata is immutable and shared via module level cache
+        # as a (columns, name-to-column dict) pair.
+        # Cache miss happens only once per (table, exclude) per process.
+        cached = _schema_cache.get((table, tuple(exclude)))
+        if cached is None:
+            # pragma_table_info() columns:
+            # cid           Column ID number
+            # name          Column name
+            # type          INTEGER | DATETIME | ...
+            # notnull       1 = NOT NULL, 0 = NULL
+            # dflt_value    Default value
+            # pk            1 = PRIMARY KEY, 0 = not
+            cursor.execute("SELECT * FROM pragma_table_info('{}')".format(table))
+            columns = tuple(
+                self.Column(
+                    name        = row[1],
+                    datatype    = row[2],
+                    nullable    = True if row[3] == 0 else False,
+                    default     = row[4],
+                    primarykey  = True if row[5] == 1 else False
                 )
-        # Get active session_id or None
-        app.logger.critical("Fix to REAL session mgmt!!")
-        cursor.execute("SELECT max(id) FROM testing_session")
-        self.session_id = cursor.fetchone()[0]
+                for row in cursor
+                if row[1] not in exclude
+            )
+            cached = (columns, {col.name: col for col in columns})
+            _schema_cache[(table, tuple(exclude))] = cached
+        self.extend(cached[0])
+        # Name-to-Column index for O(1) column resolution
+        self._by_name = cached[1]
+
+
+    @property
+    def session_id(self):
+        """Active session_id (or None). Queried lazily on first access so that DataObject construction itself stays free of database round-trips."""
+        if self._session_id is None:
+            app.logger.critical("Fix to REAL session mgmt!!")
+            self.cursor.execute("SELECT max(id) FROM testing_session")
+            self._session_id = self.cursor.fetchone()[0]
+        return self._session_id
 
 
     @property
@@ -208,7 +292,6 @@ class DataObject(list):
         else:
             flist = []
             for col in self:
-                app.logger.debug(col.name)
                 if col.primarykey and include_primarykeys:
                     # Forced inclusion for pk
                     flist.append(col)
@@ -230,12 +313,7 @@ class DataObject(list):
 
     def select_typecast(self, column):
         """Take column object argument and return string representation of the column name, with datatype specific typecasting, if necessary."""
-        if column.datatype == 'TIMESTAMP':
-            return "CAST(strftime('%s', {0}) as integer) AS {0}".format(column.name)
-        elif column.datatype == 'DATETIME':
-            return "datetime({0}) AS {0}".format(column.name)
-        else:
-            return column.name
+        return _select_templates.get(column.datatype, '{0}').format(column.name)
 
 
     def select_columns(
@@ -246,62 +324,44 @@ class DataObject(list):
     ):
         """Provide datatype specific formatting for SQL queries. Optional 'include' list can be provided, limiting the parsing to specified. However, if 'include_primary_keys' is True, the parsed string will always contain also the primary key columns - even if they are not defined in the 'include' and excluded in the 'exclude' list.
         
-        If a column is defined in both 'include' and 'exclude', exclude list will take precedence and column is not included. Only exception to this rule are primary key columns (when 'include_primarykeys' is True)."""
-        # Purge primary keys from exclude list, if 'include_primarykeys'
-        if exclude and include_primarykeys:
-            exclude = [col for col in exclude if col not in self.primarykeys]
-        # Compile list of column objects/dicts
-        if not include:
-            # empty 'include' equals ALL fields (except 'excluded')
-            flist = [col for col in self if col.name not in exclude]
-        else:
-            flist = []
-            for col in self:
-                if col.primarykey and include_primarykeys:
-                    flist.append(col)
-                elif col.name in include and col.name not in exclude:
-                    flist.append(col)
+        If a column is defined in both 'include' and 'exclude', exclude list will take precedence and column is not included. Only exception to this rule are primary key columns (when 'include_primarykeys' is True).
+
+        Built clauses are cached per (table, include, exclude, include_primarykeys) signature, as they depend only on the static schema."""
+        key = (self.table, tuple(include), tuple(exclude), include_primarykeys)
+        cached = _select_clause_cache.get(key)
+        if cached is not None:
+            return cached
+        # Column filtering rules live in get_column_objects() alone
+        cols = self.get_column_objects(include, exclude, include_primarykeys)
 
-        slist = []
         # NOTE: Fractional timestamp (Warning - fractional inaccuracy!)
         # SELECT (julianday(timestamp) - 2440587.5) * 86400.0
         # 1541695244 (exact) becomes: 1541695244.00001
-        for col in flist:
-            if col.datatype == 'TIMESTAMP':
-                slist.append(
-                    "CAST(strftime('%s', {0}) as integer) AS {0}"
-                    .format(col.name)
-                )
-            elif col.datatype == 'DATETIME':
-                slist.append(
-                    "datetime({0}) AS {0}"
-                    .format(col.name)
-                )
-            else:
-                slist.append(col.name)
-        return ", ".join(slist)
+        clause = ", ".join(
+            _select_templates.get(col.datatype, '{0}').format(col.name)
+            for col in cols
+        )
+        _select_clause_cache[key] = clause
+        return clause
 
 
     def where_condition(self, column):
-        """Return formatting for condition column based on datatype."""
-        col = None
-        for c in self:
-            if c.name == column:
-                col = c
-                break
+        """Return formatting for condition column based on datatype. Formatted conditions are cached per (table, column)."""
+        key = (self.table, column)
+        cached = _where_condition_cache.get(key)
+        if cached is not None:
+            return cached
+        col = self._by_name.get(column)
         if not col:
             raise ValueError("Non-existent column specified")
         # return suitable conversion
-        if col.datatype == 'TIMESTAMP':
-            return "CAST(strftime('%s', {}) as integer)".format(col.name)
-        elif col.datatype == 'DATETIME':
-            return "datetime({})".format(col.name)
-        else:
-            return "{}".format(col.name)
+        condition = _where_templates.get(col.datatype, '{0}').format(col.name)
+        _where_condition_cache[key] = condition
+        return condition
 
 
     def __str__(self):
-        return "\n".join([str(c) for c in self])
+        return "\n".join([c.name for c in self])
 
 
 
@@ -324,29 +384,42 @@ def __make_response(code, payload):
         #
         # Common api element for JSON responses
         #
+        # flask.g is a LocalProxy; every attribute read goes through a
+        # thread-local lookup. Dereference it once instead of per field.
+        timers = g._get_current_object()
         payload['api'] = {
             'version'   : app.apiversion,
-            't_cpu'     : time.process_time() - g.t_cpu_start,
-            't_real'    : time.perf_counter() - g.t_real_start
+            't_cpu'     : time.process_time() - timers.t_cpu_start,
+            't_real'    : time.perf_counter() - timers.t_real_start
         }
-        # NOTE: PLEASE remove 'indent' and 'sort_keys' when developing is done!!!
-        # 'default=str' is useful setting to handle obscure data, leave it.
+        # Response data rows contain only primitives (TIMESTAMP columns are
+        # cast to int already at the SELECT layer), so the common path can
+        # serialize without a per-object 'default' callback. 'default=str'
+        # remains as the fallback for obscure data in exceptional payloads.
         # (for example; "datetime.timedelta(31) is not JSON serializable")
         # https://stackoverflow.com/questions/7907596/json-dumps-vs-flask-jsonify
-        t = time.perf_counter()
-        #payload = json.dumps(payload, indent=4, sort_keys=True, default=str)
-        payload = json.dumps(payload, default=str)
-        app.logger.debug("REMOVE SORT! json.dumps(): {:.1f}ms".format((time.perf_counter() - t) * 1000))
-
-        response = app.response_class(
-            response    = payload,
-            status      = code,
-            mimetype    = 'application/json'
+        if orjson:
+            # Returns bytes, which Flask response_class accepts as-is
+            try:
+                payload = orjson.dumps(payload)
+            except TypeError:
+                payload = orjson.dumps(payload, default=str)
+        else:
+            payload = json.dumps(payload, default=str)
+
+        # Constructing the Response with a ready Headers object sidesteps
+        # Werkzeug's per-response mimetype option parsing, and
+        # direct_passthrough tells it not to iterate/re-encode the body
+        # (payload is already bytes/str).
+        return Response(
+            payload,
+            status  = code,
+            headers = Headers([
+                ('Content-Type', 'application/json'),
+                ('Allow',        _allow_header(request.url_rule))
+            ]),
+            direct_passthrough = True
         )
-        allow = [method for method in request.url_rule.methods if method not in ('HEAD', 'OPTIONS')]
-        response.headers['Allow']        = ", ".join(allow)
-        response.headers['Content-Type'] = 'application/json'
-        return response
     except Exception as e:
         # VERY IMPORTANT! Do NOT re-raise the exception!
         app.logger.exception("Internal __make_response() error!")
@@ -400,7 +473,6 @@ def exception_response(ex):
             else:
                 # Unexpected error, log trace by using logger.exception()
                 app.logger.exception(str(ex))
-                from traceback import format_exception
                 e = format_exception(type(ex), ex, ex.__traceback__)
                 response_payload = {
                     "error" : e[-1],
@@ -414,7 +486,7 @@ def exception_response(ex):
                 {
                     "error"     : "Uknown",
                     "details"   : "api.exception_response() received unsupported argument",
-                    "type"      : type(ex)
+                    "type"      : str(type(ex))
                 }
             )
     except Exception as e:
@@ -435,31 +507,49 @@ def exception_response(ex):
 # Takes queried cursor and streams it out as CSV file
 def stream_result_as_csv(cursor):
     """Takes one argument, SQLite3 query result, which is streamed out as CSV file."""
-    import io       # for StringIO
-    import csv
+    # Number of rows written into each streamed chunk. Yielding row-by-row
+    # costs a generator resume and an HTTP chunk per row; batching amortizes
+    # that overhead while keeping memory bounded to 'batch_size' rows.
+    batch_size = 500
+    # Rows containing only numbers (and NULLs) never need quoting and can
+    # skip the per-field quoting decisions of csv.writer entirely. PATE
+    # telemetry tables are almost purely numeric, so this is the common
+    # path for the large exports.
+    def all_numeric(batch):
+        for row in batch:
+            for value in row:
+                if not isinstance(value, (int, float)) and value is not None:
+                    return False
+        return True
     # Generator object for the Response() to use
     def generate(cursor):
-        data = io.StringIO()
-        writer = csv.writer(data)
-
         # Yield header
-        writer.writerow(
+        data = io.StringIO()
+        csv.writer(data).writerow(
             (key[0] for key in cursor.description)
         )
         yield data.getvalue()
-        data.seek(0)
-        data.truncate(0)
-
-        # Yeild data
-        for row in cursor:
-            writer.writerow(row)
-            yield data.getvalue()
-            data.seek(0)
-            data.truncate(0)
-
-    from werkzeug.datastructures    import Headers
-    from werkzeug.wrappers          import Response
-    from flask                      import stream_with_context
+
+        # Yield data in batches of 'batch_size' rows
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            if all_numeric(batch):
+                # Fast path - plain join, no quoting machinery
+                yield "".join(
+                    ",".join(
+                        "" if value is None else str(value)
+                        for value in row
+                    ) + "\r\n"
+                    for row in batch
+                )
+            else:
+                # Fresh buffer per batch - cheaper than seek(0)/truncate(0)
+                data = io.StringIO()
+                csv.writer(data).writerows(batch)
+                yield data.getvalue()
+
     #
     # Response header
     #
@@ -485,6 +575,39 @@ def stream_result_as_csv(cursor):
 
 
 
+###############################################################################
+#
+# Numeric post-processing support (optional NumPy + Numba)
+#
+#   DataObject subclasses that summarize or decimate telemetry time series
+#   should not loop over cursor rows in Python. Instead, write the reduction
+#   as an explicit loop over an array, decorate it with api.jit_reducer and
+#   run it through api.numba_aggregate(cursor, reducer). With Numba
+#   installed the loop is compiled to native code (cached on disk, so the
+#   compilation cost is paid once, not per worker start); without it the
+#   same function runs as ordinary Python.
+#
+#   NOTE: Keep the loops in the reducer explicit - Numba compiles plain
+#         loops better than clever vectorized one-liners.
+#
+def jit_reducer(function):
+    """Compile a numeric reducer kernel with numba.njit(cache=True) when Numba is available; return the function unchanged when it is not."""
+    if njit is None:
+        return function
+    return njit(cache=True)(function)
+
+
+def numba_aggregate(cursor, reducer, dtype='float64'):
+    """Fetch a numeric query result into a NumPy array in one pass and apply 'reducer' to it. Single-column results are passed as a 1-D array, multi-column results as a 2-D (rows x columns) array. Falls back to handing the reducer a plain list of row tuples when NumPy is not installed."""
+    if np is None:
+        return reducer(cursor.fetchall())
+    if len(cursor.description) == 1:
+        values = np.fromiter((row[0] for row in cursor), dtype=dtype)
+    else:
+        values = np.asarray(cursor.fetchall(), dtype=dtype)
+    return reducer(values)
+
+
 ###############################################################################
 #
 #
@@ -11,6 +11,8 @@
 #   0.1.1   2018.10.14  Fixed the version output in the logging message.
 #   0.1.2   2018.10.23  Entire Flash application moved into this file.
 #   0.1.3   2018.10.29  Print lapsed ms in @app.teardown_request debug message.
+#   0.2.0   2026.09.01  Reuse SQLite3 connections (one per worker thread).
+#   0.2.1   2026.09.01  SQLite3 PRAGMA tuning on connection setup.
 #
 #
 # Code in this file gets executed ONLY ONCE, when the uWSGI is started.
@@ -27,11 +29,17 @@
 #
 import os
 import time
+import queue
+import atexit
 import logging
 import sqlite3
+import threading
 
 from logging.handlers       import RotatingFileHandler
+from logging.handlers       import QueueHandler
+from logging.handlers       import QueueListener
 from logging                import Formatter
+from pathlib                import Path
 from flask                  import Flask
 from flask                  import g
 
@@ -49,43 +57,40 @@ app = Flask(
 )
 
 
+#
+# Version numbers
+#
+# APIVERSION holds the JSON API implementation version (integer) and
+# APPVERSION the middleware version ("x.y.z"); in both, the value is the
+# first non-blank, non-comment line. Exception handling is deliberately
+# explicit - a corrupted version file should not be silently skipped over
+# line by line.
+#
+def read_version_file(filename):
+    """Return first non-blank, non-comment token from file, or None."""
+    for line in Path(filename).read_text().splitlines():
+        line = line.strip()
+        if line and line[0] != '#':
+            return line.split()[0]
+    return None
+
 #
 # PATE Monitor JSON API implementation version number (integer)
 #
 try:
-    with open('APIVERSION') as version_file:
-        for line in version_file:
-            try:
-                apiversion = int(line.strip())
-                break
-            except:
-                pass
-except:
+    app.apiversion = int(read_version_file('APIVERSION'))
+except (OSError, TypeError, ValueError):
     # File issues
-    apiversion = -1
-finally:
-    setattr(app, 'apiversion', apiversion)
+    app.apiversion = -1
 
 #
 # PATE Monitor Middleware application version
 #
 try:
-    with open('APPVERSION') as vfile:
-        for line in vfile:
-            appversion = line.strip()
-            if not len(appversion):
-                continue
-            if appversion[0:1] == '#':
-                # Its a comment
-                continue
-            else:
-                appversion = appversion.split()[0]
-                break
-except:
+    app.appversion = read_version_file('APPVERSION') or "0.0.0"
+except OSError:
     # File issues
-    appversion = "0.0.0"
-finally:
-    setattr(app, 'appversion', appversion)
+    app.appversion = "0.0.0"
 
 
 #
@@ -107,6 +112,11 @@ app.config.from_pyfile('application.conf')
 #
 # Logging
 #
+# Request threads must not block on disk I/O for log records. The file
+# handler is owned by a background QueueListener thread; the application
+# logger itself only enqueues records (a lock-free operation from the
+# request's point of view). Call sites are unaffected.
+#
 handler = RotatingFileHandler(
     app.config.get('LOG_FILENAME', 'application.log'),
     maxBytes    = 1000000,
@@ -118,7 +128,12 @@ handler.setFormatter(
         '[in %(pathname)s:%(lineno)d]'
     )
 )
-app.logger.addHandler(handler)
+_log_queue = queue.Queue(-1)
+app.logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, handler)
+_log_listener.start()
+# Flush queued records (and stop the listener thread) on worker shutdown
+atexit.register(_log_listener.stop)
 # Setting is given as a string, which needs to be converted into
 # the integer value that logger module uses. Default to DEBUG.
 # Using getattr() with default instead of logging.getLevelName()
@@ -174,6 +189,61 @@ if not app.config.get('COMMAND_POLL_INTERVAL', None):
 
 
 
+###############################################################################
+#
+# DATABASE CONNECTIONS
+#
+#       SQLite3 connection open is not free (file open, header read, PRAGMA
+#       parsing) and doing it per HTTP request puts a needless floor on the
+#       latency of even the smallest endpoints. Instead, each worker thread
+#       opens its connection once and keeps reusing it. Connections run in
+#       autocommit mode (isolation_level=None) and @app.teardown_request
+#       issues a rollback, so no locks are carried over between requests.
+#
+_connection_holder = threading.local()
+_open_connections  = []
+
+
+def get_connection():
+    """Return this thread's SQLite3 connection, opening it on first use."""
+    connection = getattr(_connection_holder, 'db', None)
+    if connection is None:
+        connection = sqlite3.connect(
+            app.config.get('SQLITE3_DATABASE_FILE', 'pmapi.sqlite3'),
+            check_same_thread = False,
+            isolation_level   = None
+        )
+        # SQLite3 defaults are very conservative (small page cache, disk
+        # based temp tables, no memory mapping). Tune each connection for
+        # the read-heavy API workload. WAL allows readers to proceed
+        # concurrently with writers and synchronous=NORMAL is the safe
+        # setting with WAL. journal_mode is persistent, but issuing it on
+        # an already-WAL database is a no-op, so it is safe to repeat here.
+        # Runs once per physical connection (= once per worker thread).
+        connection.executescript(
+            "PRAGMA foreign_keys = 1;"
+            "PRAGMA journal_mode = WAL;"
+            "PRAGMA synchronous = NORMAL;"
+            "PRAGMA temp_store = MEMORY;"
+            "PRAGMA cache_size = -64000;"
+            "PRAGMA mmap_size = 268435456;"
+        )
+        _connection_holder.db = connection
+        _open_connections.append(connection)
+    return connection
+
+
+@atexit.register
+def close_connections():
+    """Close pooled connections when the worker shuts down."""
+    for connection in _open_connections:
+        try:
+            connection.close()
+        except sqlite3.Error:
+            pass
+    _open_connections.clear()
+
+
 ###############################################################################
 #
 # REQUEST HANDLING
@@ -183,8 +253,7 @@ if not app.config.get('COMMAND_POLL_INTERVAL', None):
 @app.before_request
 def before_request():
     """
-    Opens a new database connection if there is none yet for the
-    current application context.
+    Assigns this thread's database connection for the request.
     """
     #
     # Start timing
@@ -195,17 +264,12 @@ def before_request():
     #
     g.t_real_start = time.perf_counter()
     g.t_cpu_start  = time.process_time()
-    app.logger.debug("@app.before_request")
 
     #
     # Ensure database connection
     #
     if not hasattr(g, 'db'):
-        g.db = sqlite3.connect(
-            app.config.get('SQLITE3_DATABASE_FILE', 'pmapi.sqlite3')
-        )
-        cursor = g.db.cursor()
-        cursor.execute("PRAGMA foreign_keys = 1")
+        g.db = get_connection()
 
     return
 
@@ -214,6 +278,17 @@ def before_request():
 #
 import routes
 
+#
+# Warm up the URL map now that all routes are registered. Werkzeug sorts
+# and binds the map lazily on the first request; forcing it here (and
+# pre-building the per-rule Allow headers while walking the rules) keeps
+# that work out of the first request of each endpoint.
+#
+import api
+app.url_map.update()
+for rule in app.url_map.iter_rules():
+    api._allow_header(rule)
+
 #
 # Executed each time application context tears down
 # (request ends)
@@ -221,14 +296,18 @@ import routes
 @app.teardown_request
 def teardown_request(error):
     """
-    Closes the database again at the end of the request.
+    Releases any locks held by the request. The connection itself stays
+    open for reuse by the next request served by this thread.
     """
-    app.logger.debug(
-        "@app.teardown_request ({:.1f}ms)"
-        .format((time.perf_counter() - g.t_real_start) * 1000)
-    )
+    # Guarded so the argument formatting does not run when DEBUG records
+    # would be filtered out anyway.
+    if app.logger.isEnabledFor(logging.DEBUG):
+        app.logger.debug(
+            "@app.teardown_request ({:.1f}ms)"
+            .format((time.perf_counter() - g.t_real_start) * 1000)
+        )
     if hasattr(g, 'db'):
-        g.db.close()
+        g.db.rollback()
 
 
 # EOF
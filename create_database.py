@@ -0,0 +1,152 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Turku University (2018) Department of Future Technologies
+# Foresail-1 / PATE Monitor / Middleware (PMAPI)
+# Database creation script
+#
+# create_database.py - Jani Tammi <jasata@utu.fi>
+#
+#   0.1.0   2018.10.14  Initial version.
+#   0.1.1   2018.10.20  Hit counter table.
+#   0.1.2   2018.10.26  Housekeeping table.
+#   0.1.3   2018.11.11  'classifieddata' renamed to 'hitcount'.
+#   0.2.0   2026.09.01  Moved into pmgui repository; PRAGMA tuning.
+#   0.2.1   2026.09.01  All DDL in one transaction (one fsync, not ~18).
+#   0.3.0   2026.09.01  Long-form hitcount; DDL moved to util/schema.sql.
+#   0.3.1   2026.09.01  Connection lifetime managed by contextlib.closing().
+#
+#
+#   (Re)creates the PATE Monitor SQLite3 database. All existing tables are
+#   dropped and created anew - ALL DATA IS LOST! This script is executed
+#   only on installation and on development resets, never by the running
+#   middleware.
+#
+#   The schema itself is the fully expanded, diff-reviewable DDL in
+#   'util/schema.sql'. This script only wraps it with the drops, the
+#   transaction and the post-creation maintenance (VACUUM / ANALYZE).
+#
+#   Bulk data loads into the created tables should go through
+#   'util/bulk_insert.py'.
+#
+#   NOTE: Datetimes are stored as Unix timestamps (INTEGER), because this
+#         format is age-friendly for the data (no parsing ambiguities) and
+#         integer comparisons are the cheapest possible for range queries.
+#
+import sys
+import sqlite3
+
+from pathlib    import Path
+from contextlib import closing
+
+# Database file is shared with the middleware (see application.conf)
+filename = "patemon.sqlite3"
+
+# Tables in drop order; children before parent 'testing_session'.
+# 'classifieddata' is the pre-0.1.3 name for 'hitcount' and is dropped
+# so that old development databases get cleaned up.
+tables = (
+    'classifieddata',
+    'hitcount',
+    'pulseheight',
+    'housekeeping',
+    'note',
+    'command',
+    'psu',
+    'register',
+    'testing_session'
+)
+
+
+if __name__ == '__main__':
+
+    # sys.exit (not os._exit) so cleanup runs; an abrupt exit would leave
+    # WAL/SHM files behind and force recovery on the next open.
+    dbfile = Path(filename)
+    if not dbfile.is_file():
+        print("Database file '{}' does not exist!".format(filename))
+        sys.exit(1)
+
+    # isolation_level=None: no implicit transactions; the explicit
+    # BEGIN/COMMIT below controls exactly when the (single) commit happens.
+    # closing() guarantees conn.close() on every exit path. NOTE: the
+    # connection's own context manager ('with conn:') is NOT what we want
+    # here - it commits/rolls back but never closes, and the script below
+    # manages its own transaction anyway.
+    with closing(sqlite3.connect(filename, isolation_level=None)) as conn:
+        cursor = conn.cursor()
+
+        #
+        # Connection tuning
+        #
+        # The default rollback journal with synchronous=FULL pays a double
+        # fsync for every implicit DDL commit, which hurts on the Raspberry Pi
+        # SD-card storage this runs on. WAL turns each commit into a log
+        # append, and synchronous=NORMAL is the safe setting with WAL (do NOT
+        # relax to OFF; this is lab EGSE equipment, not a scratch disk).
+        # journal_mode is persistent, so the database file this script leaves
+        # behind is already tuned for the middleware's mixed workload.
+        #
+        cursor.executescript(
+            "PRAGMA journal_mode = WAL;"
+            "PRAGMA synchronous = NORMAL;"
+            "PRAGMA temp_store = MEMORY;"
+            "PRAGMA cache_size = -65536;"
+            "PRAGMA mmap_size = 268435456;"
+            "PRAGMA busy_timeout = 5000;"
+            "PRAGMA foreign_keys = ON;"
+        )
+
+        # VACUUM rewrites the entire database file, so it is only worth doing
+        # when the drops actually free pages. Record beforehand whether any of
+        # the tables exist (on a fresh install none do).
+        dropped_any = cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ({})"
+            .format(", ".join("'{}'".format(t) for t in tables))
+        ).fetchone()[0] > 0
+
+        #
+        # Drops and schema creation, all in one transaction and one
+        # executescript() batch. Each statement in its own implicit
+        # transaction would fsync per statement (~18 times); batched, the
+        # whole schema costs one commit and a failed run rolls back cleanly.
+        # 'IF EXISTS' drops need no exception handling on fresh installs.
+        # The BEGIN is part of the script because executescript() commits any
+        # transaction already pending before it runs.
+        #
+        schema = (Path(__file__).parent / "util" / "schema.sql").read_text()
+        script = (
+            "BEGIN;\n"
+            + ";\n".join("DROP TABLE IF EXISTS {}".format(t) for t in tables)
+            + ";\n"
+            + schema
+            + "COMMIT;"
+        )
+
+        # Narrow except: a KeyboardInterrupt here is NOT a creation
+        # failure and must not be reported as one.
+        try:
+            cursor.executescript(script)
+        except sqlite3.Error as e:
+            print("Database creation failed: {}".format(e))
+            raise
+
+        # VACUUM cannot run inside a transaction. Skipped on fresh
+        # databases where the drops freed nothing to reclaim.
+        if dropped_any:
+            try:
+                cursor.execute("vacuum")
+            except sqlite3.DatabaseError as e:
+                print("VACUUM failed: {}".format(e))
+                raise
+        # Seed the statistics tables so every future connection's query
+        # planner has stat entries from the start. Trivial on the freshly
+        # created (empty) tables. Must run outside any transaction; one
+        # batch, like the schema itself.
+        cursor.executescript(
+            "ANALYZE;"
+            "PRAGMA optimize;"
+        )
+        print("Database '{}' created successfully".format(filename))
+
+# EOF
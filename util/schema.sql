@@ -0,0 +1,235 @@
+-- Turku University (2018) Department of Future Technologies
+-- Foresail-1 / PATE Monitor / Middleware (PMAPI)
+-- SQLite3 database schema
+--
+-- util/schema.sql - Jani Tammi <jasata@utu.fi>
+--
+-- Fully expanded DDL, executed by create_database.py in a single
+-- executescript() batch. Statements here must not open or close
+-- transactions - the caller wraps this file in BEGIN/COMMIT.
+--
+-- NOTE: Datetimes are stored as Unix timestamps (INTEGER).
+
+--
+-- Testing session
+--
+CREATE TABLE testing_session
+(
+    id              INTEGER     NOT NULL PRIMARY KEY AUTOINCREMENT,
+    started         INTEGER     NOT NULL DEFAULT (strftime('%s', 'now')),
+    ended           INTEGER         NULL,
+    operator        TEXT            NULL,
+    description     TEXT            NULL
+);
+
+--
+-- Raw pulse height data
+--
+CREATE TABLE pulseheight
+(
+    timestamp       INTEGER     NOT NULL PRIMARY KEY,
+    session_id      INTEGER     NOT NULL,
+    telescope       TEXT            NULL,
+    ac              INTEGER         NULL,
+    d1              INTEGER         NULL,
+    d2              INTEGER         NULL,
+    d3              INTEGER         NULL,
+    FOREIGN KEY (session_id) REFERENCES testing_session (id)
+) WITHOUT ROWID;
+
+-- Without this index, every session-scoped query - and every foreign
+-- key check run for a testing_session delete - full-scans the table.
+-- The same reasoning applies to the other session_id indexes below.
+CREATE INDEX pulseheight_session ON pulseheight (session_id, timestamp);
+
+--
+-- Classified hit counters (long form)
+--
+-- One row per counter per instrument rotation. A counter is
+-- addressed by (sector, kind, idx):
+--
+--     sector  0..36 (index 0 is the sun-pointing telescope)
+--     kind    'p' | 'e'                       sector counters
+--             'ac' | 'd1p' | 'd2p' | 'trash'  telescope counters
+--             (telescope counters: sector 0 = st, 1 = rt)
+--     idx     1..N within the kind
+--
+-- WITHOUT ROWID: the primary key B-tree is the table itself.
+--
+CREATE TABLE hitcount
+(
+    timestamp       INTEGER     NOT NULL,
+    session_id      INTEGER     NOT NULL,
+    sector          INTEGER     NOT NULL,
+    kind            TEXT        NOT NULL,
+    idx             INTEGER     NOT NULL,
+    count           INTEGER     NOT NULL,
+    PRIMARY KEY (timestamp, sector, kind, idx),
+    FOREIGN KEY (session_id) REFERENCES testing_session (id)
+) WITHOUT ROWID;
+
+CREATE INDEX hitcount_session ON hitcount (session_id, timestamp);
+
+--
+-- Housekeeping
+--
+-- Still unspecified by instrument development. Generic numbered
+-- slots until the formal specification arrives.
+--
+CREATE TABLE housekeeping
+(
+    timestamp       INTEGER     NOT NULL DEFAULT (strftime('%s', 'now')) PRIMARY KEY,
+    session_id      INTEGER     NOT NULL,
+    hk001           INTEGER     NOT NULL,
+    hk002           INTEGER     NOT NULL,
+    hk003           INTEGER     NOT NULL,
+    hk004           INTEGER     NOT NULL,
+    hk005           INTEGER     NOT NULL,
+    hk006           INTEGER     NOT NULL,
+    hk007           INTEGER     NOT NULL,
+    hk008           INTEGER     NOT NULL,
+    hk009           INTEGER     NOT NULL,
+    hk010           INTEGER     NOT NULL,
+    hk011           INTEGER     NOT NULL,
+    hk012           INTEGER     NOT NULL,
+    hk013           INTEGER     NOT NULL,
+    hk014           INTEGER     NOT NULL,
+    hk015           INTEGER     NOT NULL,
+    hk016           INTEGER     NOT NULL,
+    hk017           INTEGER     NOT NULL,
+    hk018           INTEGER     NOT NULL,
+    hk019           INTEGER     NOT NULL,
+    hk020           INTEGER     NOT NULL,
+    hk021           INTEGER     NOT NULL,
+    hk022           INTEGER     NOT NULL,
+    hk023           INTEGER     NOT NULL,
+    hk024           INTEGER     NOT NULL,
+    hk025           INTEGER     NOT NULL,
+    hk026           INTEGER     NOT NULL,
+    hk027           INTEGER     NOT NULL,
+    hk028           INTEGER     NOT NULL,
+    hk029           INTEGER     NOT NULL,
+    hk030           INTEGER     NOT NULL,
+    hk031           INTEGER     NOT NULL,
+    hk032           INTEGER     NOT NULL,
+    hk033           INTEGER     NOT NULL,
+    hk034           INTEGER     NOT NULL,
+    hk035           INTEGER     NOT NULL,
+    hk036           INTEGER     NOT NULL,
+    hk037           INTEGER     NOT NULL,
+    hk038           INTEGER     NOT NULL,
+    hk039           INTEGER     NOT NULL,
+    hk040           INTEGER     NOT NULL,
+    hk041           INTEGER     NOT NULL,
+    hk042           INTEGER     NOT NULL,
+    hk043           INTEGER     NOT NULL,
+    hk044           INTEGER     NOT NULL,
+    hk045           INTEGER     NOT NULL,
+    hk046           INTEGER     NOT NULL,
+    hk047           INTEGER     NOT NULL,
+    hk048           INTEGER     NOT NULL,
+    hk049           INTEGER     NOT NULL,
+    hk050           INTEGER     NOT NULL,
+    hk051           INTEGER     NOT NULL,
+    hk052           INTEGER     NOT NULL,
+    hk053           INTEGER     NOT NULL,
+    hk054           INTEGER     NOT NULL,
+    hk055           INTEGER     NOT NULL,
+    hk056           INTEGER     NOT NULL,
+    hk057           INTEGER     NOT NULL,
+    hk058           INTEGER     NOT NULL,
+    hk059           INTEGER     NOT NULL,
+    hk060           INTEGER     NOT NULL,
+    hk061           INTEGER     NOT NULL,
+    hk062           INTEGER     NOT NULL,
+    hk063           INTEGER     NOT NULL,
+    hk064           INTEGER     NOT NULL,
+    hk065           INTEGER     NOT NULL,
+    hk066           INTEGER     NOT NULL,
+    hk067           INTEGER     NOT NULL,
+    hk068           INTEGER     NOT NULL,
+    hk069           INTEGER     NOT NULL,
+    hk070           INTEGER     NOT NULL,
+    hk071           INTEGER     NOT NULL,
+    hk072           INTEGER     NOT NULL,
+    hk073           INTEGER     NOT NULL,
+    hk074           INTEGER     NOT NULL,
+    hk075           INTEGER     NOT NULL,
+    hk076           INTEGER     NOT NULL,
+    hk077           INTEGER     NOT NULL,
+    hk078           INTEGER     NOT NULL,
+    hk079           INTEGER     NOT NULL,
+    hk080           INTEGER     NOT NULL,
+    FOREIGN KEY (session_id) REFERENCES testing_session (id)
+) WITHOUT ROWID;
+
+CREATE INDEX housekeeping_session ON housekeeping (session_id, timestamp);
+
+--
+-- Operator notes
+--
+CREATE TABLE note
+(
+    id              INTEGER     NOT NULL PRIMARY KEY AUTOINCREMENT,
+    session_id      INTEGER     NOT NULL,
+    text            TEXT        NOT NULL,
+    created         INTEGER     NOT NULL DEFAULT (strftime('%s', 'now')),
+    FOREIGN KEY (session_id) REFERENCES testing_session (id)
+);
+
+CREATE INDEX note_session ON note (session_id, created);
+
+--
+-- Command interface (middleware <-> backend)
+--
+CREATE TABLE command
+(
+    id              INTEGER     NOT NULL PRIMARY KEY AUTOINCREMENT,
+    session_id      INTEGER     NOT NULL,
+    interface       TEXT        NOT NULL,
+    command         TEXT        NOT NULL,
+    value           TEXT            NULL,
+    result          TEXT            NULL,
+    created         INTEGER     NOT NULL DEFAULT (strftime('%s', 'now')),
+    handled         INTEGER         NULL,
+    FOREIGN KEY (session_id) REFERENCES testing_session (id)
+);
+
+CREATE INDEX command_session ON command (session_id, created);
+
+--
+-- PSU (single row, maintained by the OBC emulator backend)
+--
+CREATE TABLE psu
+(
+    id                  INTEGER     NOT NULL PRIMARY KEY,
+    power               TEXT        NOT NULL,
+    voltage_setting     REAL        NOT NULL,
+    current_limit       REAL        NOT NULL,
+    measured_voltage    REAL        NOT NULL,
+    measured_current    REAL        NOT NULL,
+    state               TEXT        NOT NULL,
+    modified            INTEGER     NOT NULL DEFAULT (strftime('%s', 'now'))
+);
+
+CREATE TRIGGER psu_ari
+AFTER UPDATE ON psu
+FOR EACH ROW
+BEGIN
+    UPDATE psu SET modified = strftime('%s', 'now') WHERE id = NEW.id;
+END;
+
+--
+-- PATE register values
+--
+CREATE TABLE register
+(
+    id              INTEGER     NOT NULL PRIMARY KEY AUTOINCREMENT,
+    pate_id         INTEGER     NOT NULL,
+    value           INTEGER     NOT NULL,
+    retrieved       INTEGER     NOT NULL DEFAULT (strftime('%s', 'now'))
+);
+
+CREATE INDEX register_pate ON register (pate_id, retrieved);
+
+-- EOF